@@ -1,24 +1,594 @@
 """Functions and classes for Board pieces (shapes)"""
-from typing import NamedTuple, Optional, Set
+from functools import lru_cache
+from typing import (
+    AbstractSet,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from blokus.point import Point, point_from_tuple
+
+
+# A ShapeMask packs a shape into an 8x8 tile, one bit per cell, where the bit for
+# the cell in column c and row r is 1 << (r * TILE_WIDTH + c). Points are kept in
+# columns and rows 1-6 so that their sides and corners always fit inside the tile.
+TILE_WIDTH = 8
+TILE_MASK = (1 << TILE_WIDTH * TILE_WIDTH) - 1
+TILE_LAST = TILE_WIDTH - 1
+TILE_SPAN = TILE_WIDTH - 2
+
+# the bits of the tile's first column, one in every row
+_FIRST_COLUMN = sum(1 << row * TILE_WIDTH for row in range(TILE_WIDTH))
+
+
+def _tile_permutation(
+    transform: Callable[[int, int], Tuple[int, int]]
+) -> Tuple[int, ...]:
+    """Return the destination bit of each tile bit under a (col, row) transform."""
+    table = []
+    for bit in range(TILE_WIDTH * TILE_WIDTH):
+        row, col = divmod(bit, TILE_WIDTH)
+        new_col, new_row = transform(col, row)
+        table.append(new_row * TILE_WIDTH + new_col)
+    return tuple(table)
+
+
+# bit permutations for every rotation (clockwise) and reflection of the whole tile
+TILE_PERMUTATIONS: Dict[str, Tuple[int, ...]] = {
+    "rotate90": _tile_permutation(lambda col, row: (row, TILE_LAST - col)),
+    "rotate180": _tile_permutation(lambda col, row: (TILE_LAST - col, TILE_LAST - row)),
+    "rotate270": _tile_permutation(lambda col, row: (TILE_LAST - row, col)),
+    "reflect_x": _tile_permutation(lambda col, row: (TILE_LAST - col, row)),
+    "reflect_y": _tile_permutation(lambda col, row: (col, TILE_LAST - row)),
+    "transpose": _tile_permutation(lambda col, row: (row, col)),
+    "antitranspose": _tile_permutation(
+        lambda col, row: (TILE_LAST - row, TILE_LAST - col)
+    ),
+}
+
+
+ByteTables = Tuple[Tuple[int, ...], ...]
+
+
+def _byte_tables(permutation: Tuple[int, ...]) -> ByteTables:
+    """
+    Return a 256-entry table for each byte of a tile mask.
+
+    Entry b of table i is the permuted mask of the bits b << (8 * i), so a whole
+    mask is permuted by looking up each of its bytes and or-ing the results.
+    """
+    tables = []
+    for index in range(TILE_WIDTH * TILE_WIDTH // 8):
+        table = [0] * 256
+        for value in range(1, 256):
+            low = value & -value
+            bit = index * 8 + low.bit_length() - 1
+            table[value] = table[value ^ low] | 1 << permutation[bit]
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+TILE_BYTE_TABLES: Dict[str, ByteTables] = {
+    name: _byte_tables(permutation) for name, permutation in TILE_PERMUTATIONS.items()
+}
+
+
+Matrix = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+# the eight rotations (clockwise) and reflections of the plane around (0, 0), each as
+# a matrix ((a, b), (c, d)) that maps (x, y) to (a * x + b * y, c * x + d * y)
+DIHEDRAL_TRANSFORMS: Tuple[Matrix, ...] = (
+    ((1, 0), (0, 1)),
+    ((0, 1), (-1, 0)),
+    ((-1, 0), (0, -1)),
+    ((0, -1), (1, 0)),
+    ((-1, 0), (0, 1)),
+    ((0, 1), (1, 0)),
+    ((1, 0), (0, -1)),
+    ((0, -1), (-1, 0)),
+)
+
+
+# the byte tables that apply each matrix but the identity to a tile mask
+_DIHEDRAL_BYTE_TABLES: Dict[Matrix, ByteTables] = {
+    DIHEDRAL_TRANSFORMS[1]: TILE_BYTE_TABLES["rotate90"],
+    DIHEDRAL_TRANSFORMS[2]: TILE_BYTE_TABLES["rotate180"],
+    DIHEDRAL_TRANSFORMS[3]: TILE_BYTE_TABLES["rotate270"],
+    DIHEDRAL_TRANSFORMS[4]: TILE_BYTE_TABLES["reflect_x"],
+    DIHEDRAL_TRANSFORMS[5]: TILE_BYTE_TABLES["transpose"],
+    DIHEDRAL_TRANSFORMS[6]: TILE_BYTE_TABLES["reflect_y"],
+    DIHEDRAL_TRANSFORMS[7]: TILE_BYTE_TABLES["antitranspose"],
+}
+
+
+def _rotation(  # pylint: disable=invalid-name
+    around: Point, degrees: int
+) -> Tuple[Matrix, Tuple[int, int]]:
+    """Return the matrix and shift that rotate the plane n degrees around a Point."""
+    quarters, remainder = divmod(degrees % 360, 90)
+    if remainder:
+        raise ValueError("degrees must be a multiple of 90")
+    matrix = DIHEDRAL_TRANSFORMS[quarters]
+    (a, b), (c, d) = matrix
+    return matrix, (
+        around.x - a * around.x - b * around.y,
+        around.y - c * around.x - d * around.y,
+    )
+
+
+def _reflection(
+    line_x: Optional[int], line_y: Optional[int]
+) -> Tuple[Matrix, Tuple[int, int]]:
+    """Return the matrix and shift that reflect the plane over x and/or y lines."""
+    matrix = ((1 if line_x is None else -1, 0), (0, 1 if line_y is None else -1))
+    return matrix, (
+        0 if line_x is None else 2 * line_x,
+        0 if line_y is None else 2 * line_y,
+    )
+
+
+def permute_mask(mask: int, tables: ByteTables) -> int:
+    """Return a new tile mask by permuting its bits one byte at a time."""
+    return (
+        tables[0][mask & 0xFF]
+        | tables[1][mask >> 8 & 0xFF]
+        | tables[2][mask >> 16 & 0xFF]
+        | tables[3][mask >> 24 & 0xFF]
+        | tables[4][mask >> 32 & 0xFF]
+        | tables[5][mask >> 40 & 0xFF]
+        | tables[6][mask >> 48 & 0xFF]
+        | tables[7][mask >> 56 & 0xFF]
+    )
+
+
+def normalize_mask(mask: int) -> int:
+    """Return a tile mask shifted so its lowest occupied row and column are 1."""
+    cols = mask | mask >> 32
+    cols |= cols >> 16
+    cols |= cols >> 8
+    cols &= 0xFF
+    row = ((mask & -mask).bit_length() - 1) // TILE_WIDTH
+    col = (cols & -cols).bit_length() - 1
+    # a mask filling the first and last columns stays put, or its cells would wrap
+    shift = (row - 1) * TILE_WIDTH + col - (0 if cols & 0x81 == 0x81 else 1)
+    return mask >> shift if shift >= 0 else mask << -shift
+
+
+def _shift_borders(mask: int, width: int, height: int) -> Tuple[int, int]:
+    """
+    Return the side and corner bits of a mask with height rows of width bits.
+
+    A shift of one column wraps cells across the mask's edge into the neighboring
+    row, so each such shift clears the column that the wrapped cells land in.
+    """
+    full = (1 << width * height) - 1
+    first_column = full // ((1 << width) - 1)
+    not_first = full & ~first_column
+    not_last = full & ~(first_column << width - 1)
+    neighbors = (
+        (mask << 1 & not_first)
+        | (mask >> 1 & not_last)
+        | (mask << width)
+        | (mask >> width)
+    )
+    sides = neighbors & ~mask & full
+    diagonals = (
+        (mask << width + 1 & not_first)
+        | (mask << width - 1 & not_last)
+        | (mask >> width - 1 & not_first)
+        | (mask >> width + 1 & not_last)
+    )
+    return sides, diagonals & ~(mask | sides) & full
+
+
+def sides_mask(mask: int) -> int:
+    """Return the mask of cells sharing a side with, but not in, a tile mask."""
+    sides, _ = _shift_borders(mask, TILE_WIDTH, TILE_WIDTH)
+    return sides
+
+
+def corners_mask(mask: int) -> int:
+    """Return the mask of cells touching only the corners of a tile mask."""
+    _, corners = _shift_borders(mask, TILE_WIDTH, TILE_WIDTH)
+    return corners
+
+
+def _bits_to_points(bits: int, width: int, left: int, bottom: int) -> FrozenSet[Point]:
+    """
+    Return the Points of the set bits in a mask with rows of width bits.
+
+    The first bit of the mask is the board Point (left, bottom).
+    """
+    points = []
+    while bits:
+        low = bits & -bits
+        row, col = divmod(low.bit_length() - 1, width)
+        points.append(point_from_tuple((left + col, bottom + row)))
+        bits ^= low
+    return frozenset(points)
+
+
+class ShapeMask(NamedTuple):
+    """
+    Bitmask representation of the points in a Shape.
+
+    The mask covers an 8x8 tile whose bottom-left cell is the board Point (ox, oy).
+    Every operation is a handful of integer operations rather than a loop over Points.
+
+    Examples
+    --------
+    >>> mask = ShapeMask.from_points({Point(4, 4), Point(5, 4)})
+    >>> mask
+    ShapeMask(mask=1536, ox=3, oy=3)
+    >>> sorted(mask.rotate(around=Point(4, 4), degrees=90).points())
+    [Point(x=4, y=3), Point(x=4, y=4)]
+    """
+
+    mask: int
+    ox: int
+    oy: int
 
-from blokus.point import Point
+    @classmethod
+    def from_points(  # pylint: disable=invalid-name
+        cls, points: Iterable[Point]
+    ) -> "ShapeMask":
+        """Return the ShapeMask of a collection of Points."""
+        points = tuple(points)
+        if not points:
+            raise ValueError("cannot build a ShapeMask without any points")
+        ox = min(p.x for p in points) - 1
+        oy = min(p.y for p in points) - 1
+        mask = 0
+        for point in points:
+            col, row = point.x - ox, point.y - oy
+            if col > TILE_SPAN or row > TILE_SPAN:
+                raise ValueError(f"points must fit in a {TILE_SPAN}x{TILE_SPAN} box")
+            mask |= 1 << (row * TILE_WIDTH + col)
+        return cls(mask, ox, oy)
+
+    def points(self) -> FrozenSet[Point]:
+        """Return the set of Points represented by this mask."""
+        return _bits_to_points(self.mask, TILE_WIDTH, self.ox, self.oy)
+
+    # pylint: disable=invalid-name
+    def align(self, ox: int, oy: int) -> int:
+        """
+        Return the bits of this mask in a tile anchored at (ox, oy) instead.
+
+        Cells that fall outside of the other tile are dropped.
+
+        Examples
+        --------
+        >>> mask = ShapeMask.from_points({Point(4, 4)})
+        >>> mask.mask, mask.align(2, 3), mask.align(20, 20)
+        (512, 1024, 0)
+        """
+        dx, dy = self.ox - ox, self.oy - oy
+        if not (-TILE_WIDTH < dx < TILE_WIDTH and -TILE_WIDTH < dy < TILE_WIDTH):
+            return 0
+        # keep only the columns that stay inside the tile, so none wrap across rows
+        low, high = max(0, -dx), min(TILE_WIDTH, TILE_WIDTH - dx)
+        columns = ((1 << high - low) - 1 << low) * _FIRST_COLUMN
+        shift = dy * TILE_WIDTH + dx
+        mask = self.mask & columns
+        mask = mask << shift if shift >= 0 else mask >> -shift
+        return mask & TILE_MASK
+
+    def corners(self) -> "ShapeMask":
+        """Return a mask of the corners of this mask."""
+        return ShapeMask(corners_mask(self.mask), self.ox, self.oy)
+
+    def sides(self) -> "ShapeMask":
+        """Return a mask of the sides of this mask."""
+        return ShapeMask(sides_mask(self.mask), self.ox, self.oy)
+
+    def orientations(self) -> FrozenSet[int]:
+        """
+        Return the distinct normalized masks of every rotation and reflection.
 
+        Examples
+        --------
+        >>> len(ShapeMask.from_points({Point(0, 0), Point(1, 0)}).orientations())
+        2
+        """
+        orientations = {normalize_mask(self.mask)}
+        for tables in TILE_BYTE_TABLES.values():
+            orientations.add(normalize_mask(permute_mask(self.mask, tables)))
+        return frozenset(orientations)
 
-class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
-    """Container for the points that make up a board piece (shape)"""
+    # pylint: disable=invalid-name
+    def reflect(self, x: Optional[int] = None, y: Optional[int] = None) -> "ShapeMask":
+        """Return a new mask by reflecting over x and/or y lines."""
+        return self.transform(*_reflection(x, y))
+
+    def rotate(self, around: Point, degrees: int) -> "ShapeMask":
+        """Return a new mask rotated by n degrees around a Point."""
+        return self.transform(*_rotation(around, degrees))
+
+    def transform(self, matrix: Matrix, shift: Tuple[int, int]) -> "ShapeMask":
+        """
+        Return a new mask with its points mapped through a dihedral matrix and shift.
+
+        The bits are permuted through the matrix's byte tables, and the new tile is
+        anchored where the matrix moves the tile's bottom-left corner: the corner
+        lands on the right or top edge of the new tile when the matrix flips the
+        board's x or y axis.
+
+        Examples
+        --------
+        >>> mask = ShapeMask.from_points({Point(4, 4), Point(5, 4)})
+        >>> sorted(mask.transform(((-1, 0), (0, 1)), (0, 0)).points())
+        [Point(x=-5, y=4), Point(x=-4, y=4)]
+        """
+        (a, b), (c, d) = matrix
+        x = a * self.ox + b * self.oy + shift[0]
+        y = c * self.ox + d * self.oy + shift[1]
+        if matrix == DIHEDRAL_TRANSFORMS[0]:
+            return ShapeMask(self.mask, x, y)
+        mask = permute_mask(self.mask, _DIHEDRAL_BYTE_TABLES[matrix])
+        col = TILE_LAST if a + b < 0 else 0
+        row = TILE_LAST if c + d < 0 else 0
+        return ShapeMask(mask, x - col, y - row)
+
+
+ORIGIN = Point(0, 0)
+
+# stands in for the ShapeMask of a Shape too large to fit in a tile
+_NO_TILE = ShapeMask(0, 0, 0)
+
+
+@lru_cache(maxsize=None)
+def _border_bits(mask: int) -> Tuple[int, int]:
+    """Return the side and corner bits of a tile mask."""
+    return _shift_borders(mask, TILE_WIDTH, TILE_WIDTH)
+
+
+# the points of each piece as (dx, dy) offsets from the piece's origin
+PIECE_OFFSETS: Dict[str, Tuple[Tuple[int, int], ...]] = {
+    "I1": ((0, 0),),
+    "I2": ((0, 0), (1, 0)),
+    "I3": ((0, 0), (1, 0), (2, 0)),
+    "V3": ((0, 0), (0, 1), (1, 0)),
+    "I4": ((0, 0), (1, 0), (2, 0), (3, 0)),
+    "L4": ((0, 0), (0, 1), (1, 0), (2, 0)),
+    "O4": ((0, 0), (0, 1), (1, 0), (1, 1)),
+    "T4": ((0, 0), (-1, 0), (1, 0), (0, 1)),
+    "Z4": ((0, 0), (1, 0), (1, 1), (2, 1)),
+    "F": ((0, 0), (1, 0), (1, 1), (2, 1), (1, 2)),
+    "I5": ((0, 0), (1, 0), (2, 0), (3, 0), (4, 0)),
+    "L5": ((0, 0), (0, 1), (1, 0), (2, 0), (3, 0)),
+    "N": ((0, 0), (1, 0), (2, 0), (2, 1), (3, 1)),
+    "P": ((0, 0), (1, 0), (1, 1), (2, 0), (2, 1)),
+    "U": ((0, 0), (-1, 0), (-1, 1), (1, 0), (1, 1)),
+    "V5": ((0, 0), (0, 1), (0, 2), (1, 0), (2, 0)),
+    "W": ((0, 0), (-1, -1), (0, -1), (1, 0), (1, 1)),
+    "X": ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)),
+    "Y": ((0, 0), (-1, 0), (0, 1), (1, 0), (2, 0)),
+    "Z5": ((0, 0), (-1, -1), (0, -1), (0, 1), (1, 1)),
+}
+
+
+# Points pack into single ints as y * PACK_STRIDE + x, which is unique as long as
+# every coordinate is within PACK_STRIDE // 2 of zero
+PACK_STRIDE = 1 << 16
+_PACK_HALF = PACK_STRIDE // 2
+
+
+def _pack(point: Point) -> int:
+    """Return a Point packed into a single int."""
+    return point.y * PACK_STRIDE + point.x
+
+
+def _unpack(key: int) -> Point:
+    """Return the Point packed into an int by _pack."""
+    row, column = divmod(key + _PACK_HALF, PACK_STRIDE)
+    return point_from_tuple((column - _PACK_HALF, row))
+
+
+def _canonical(points: Iterable[Point]) -> Tuple[int, ...]:
+    """
+    Return a sorted tuple of packed Points, a cheap key for a set of Points.
+
+    Examples
+    --------
+    >>> _canonical({Point(1, 0), Point(0, -1)})
+    (-65536, 1)
+    >>> [_unpack(key) for key in _canonical({Point(1, 0), Point(0, -1)})]
+    [Point(x=0, y=-1), Point(x=1, y=0)]
+    """
+    return tuple(sorted(map(_pack, points)))
+
+
+# a shape's rotations and reflections are pure functions of its points, so each one
+# is mapped once, along with its tile, and then looked up on every later call
+@lru_cache(maxsize=4096)
+def _transform(  # pylint: disable=invalid-name
+    points: FrozenSet[Point], tile: ShapeMask, matrix: Matrix, shift: Tuple[int, int]
+) -> Tuple[FrozenSet[Point], ShapeMask]:
+    """
+    Return the points and tile mapped through a dihedral matrix and then shifted.
+
+    A tile is permuted through its byte tables and its points read back from the
+    bits; only shapes too large for a tile map each point through the matrix.
+    """
+    if tile is not _NO_TILE:
+        mapped_tile = tile.transform(matrix, shift)
+        return mapped_tile.points(), mapped_tile
+    (a, b), (c, d) = matrix
+    sx, sy = shift
+    mapped = frozenset(
+        point_from_tuple((a * x + b * y + sx, c * x + d * y + sy)) for x, y in points
+    )
+    return mapped, _NO_TILE
+
+
+Borders = Tuple[FrozenSet[Point], FrozenSet[Point]]
+
+
+# sides and corners are pure functions of a shape's points, so they are memoized
+# across Shape instances as well as stored on each instance
+@lru_cache(maxsize=4096)
+def _tile_borders(tile: ShapeMask) -> Borders:
+    """Return the sides and corners of the points in a ShapeMask."""
+    side_bits, corner_bits = _border_bits(tile.mask)
+    sides = ShapeMask(side_bits, tile.ox, tile.oy).points()
+    return sides, ShapeMask(corner_bits, tile.ox, tile.oy).points()
+
+
+# a bitmask over a shape's bounding box grows with the box's area rather than with
+# the number of points, so sparse shapes find their borders point by point instead
+_MAX_CELLS_PER_POINT = 64
+_NEIGHBORS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+_DIAGONALS = ((1, 1), (-1, 1), (-1, -1), (1, -1))
+
+
+@lru_cache(maxsize=4096)
+def _point_borders(points: FrozenSet[Point]) -> Borders:
+    """
+    Return the sides and corners of points that are too spread out for a tile.
+
+    The points are packed into a bitmask with rows just wide enough to hold them and
+    their neighbors, and the borders are found with the same shifts as for a tile.
+    Points spread over a box much larger than their number use sets instead.
+    """
+    if not points:
+        return frozenset(), frozenset()
+    left = min(point.x for point in points) - 1
+    bottom = min(point.y for point in points) - 1
+    width = max(point.x for point in points) - left + 2
+    height = max(point.y for point in points) - bottom + 2
+    if width * height > _MAX_CELLS_PER_POINT * len(points):
+        sides: Set[Point] = set()
+        corners: Set[Point] = set()
+        for col, row in points:
+            sides.update(point_from_tuple((col + i, row + j)) for i, j in _NEIGHBORS)
+            corners.update(point_from_tuple((col + i, row + j)) for i, j in _DIAGONALS)
+        sides.difference_update(points)
+        corners.difference_update(points, sides)
+        return frozenset(sides), frozenset(corners)
+    mask = 0
+    for point in points:
+        mask |= 1 << (point.y - bottom) * width + point.x - left
+
+    side_bits, corner_bits = _shift_borders(mask, width, height)
+    return (
+        _bits_to_points(side_bits, width, left, bottom),
+        _bits_to_points(corner_bits, width, left, bottom),
+    )
+
+
+class _Arrangement(NamedTuple):
+    """An arrangement of a shape around (0, 0), with the bounds of its points"""
+
+    shape: "Shape"
+    min_x: int
+    min_y: int
+    max_x: int
+    max_y: int
+
+
+@lru_cache(maxsize=4096)
+def _arrangements_at_origin(  # pylint: disable=invalid-name
+    key: Tuple[int, ...]
+) -> Tuple[_Arrangement, ...]:
+    """Return the distinct rotations and reflections of packed points around (0, 0)."""
+    if not key:
+        return ()
+    offsets = tuple(map(_unpack, key))
+    arrangements: Dict[Tuple[int, ...], _Arrangement] = {}
+    for (a, b), (c, d) in DIHEDRAL_TRANSFORMS:
+        points = [point_from_tuple((a * x + b * y, c * x + d * y)) for x, y in offsets]
+        canonical = _canonical(points)
+        if canonical not in arrangements:
+            shape = Shape(origin=ORIGIN, points=frozenset(points))
+            shape._tile()  # pylint: disable=protected-access
+            xs, ys = [p.x for p in points], [p.y for p in points]
+            arrangements[canonical] = _Arrangement(
+                shape, min(xs), min(ys), max(xs), max(ys)
+            )
+    return tuple(arrangements.values())
+
+
+class Shape:  # pylint: disable=too-many-public-methods
+    """
+    Container for the points that make up a board piece (shape)
+
+    Shapes are immutable, so the hash of a shape is computed once when it is created
+    and its bitmask, sides and corners the first time they are needed, and all of
+    them are stored on the instance. Shapes that fit in a ShapeMask tile (every
+    Blokus piece does) answer sides, corners and can_connect with integer bit
+    operations.
+    """
+
+    __slots__ = ("origin", "points", "_hash", "_mask", "_sides", "_corners")
 
     origin: Point
-    points: Set[Point]
+    points: FrozenSet[Point]
+    _hash: int
+    _mask: Optional[ShapeMask]
+    _sides: Optional[FrozenSet[Point]]
+    _corners: Optional[FrozenSet[Point]]
+
+    def __init__(self, origin: Point, points: AbstractSet[Point]) -> None:
+        object.__setattr__(self, "origin", origin)
+        points = frozenset(points)
+        object.__setattr__(self, "points", points)
+        object.__setattr__(self, "_hash", hash((origin, points)))
+        object.__setattr__(self, "_mask", None)
+        object.__setattr__(self, "_sides", None)
+        object.__setattr__(self, "_corners", None)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Shape):
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.origin == other.origin
+            and self.points == other.points
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Shape(origin={self.origin!r}, points={self.points!r})"
+
+    def __reduce__(self) -> Tuple[Type["Shape"], Tuple[Point, FrozenSet[Point]]]:
+        # rebuild through __init__, since __setattr__ rejects restoring the slots
+        return (Shape, (self.origin, self.points))
 
     def arrangements(
         self, lower: Optional[int] = None, upper: Optional[int] = None
-    ) -> Set["Shape"]:
+    ) -> FrozenSet["Shape"]:
         """
         Return all possible arrangements (rotation/reflection) of a shape.
 
         Optionally specify a lower and upper bound which will restrict the
-        arrangements falling outside those bounds.
+        arrangements falling outside those bounds. The arrangements of each shape
+        are built once around (0, 0) and cached with their bounds, so each call only
+        checks bounds and translates the arrangements that fit.
+
+        Examples
+        --------
+        >>> len(Shape.I2(Point(4, 4)).arrangements())
+        4
+        >>> len(Shape.I2(Point(4, 4)).arrangements(lower=4))
+        2
         """
+        return _arrangements(self, lower, upper)
 
     def can_connect(self, other: "Shape") -> bool:
         """
@@ -37,6 +607,20 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         [X][X]                    [X][X]
            [X]                       [X]
         """
+        tile = self._tile()
+        other_tile = other._tile()  # pylint: disable=protected-access
+        if tile is not None and other_tile is not None:
+            # a tile holds its shape and every cell around it, so the other shape
+            # can only touch this one if its tile is less than a tile width away
+            if not (
+                abs(other_tile.ox - tile.ox) < TILE_LAST
+                and abs(other_tile.oy - tile.oy) < TILE_LAST
+            ):
+                return False
+            sides, corners = _border_bits(tile.mask)
+            points = other_tile.align(tile.ox, tile.oy)
+            return bool(corners & points) and not sides & points
+
         # do any of this shape's corners intersect with the other shape's points?
         # if not, we can return False right away; otherwise we will continue.
         if self.corners().isdisjoint(other.points):
@@ -46,15 +630,68 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         # whether the sides of the shapes are touching, and return this result.
         return self.sides().isdisjoint(other.points)
 
-    def corners(self) -> Set["Point"]:
+    def corners(self) -> FrozenSet["Point"]:
         """Return a set of the corners of this Shape."""
-        all_corners = set.union(*(p.corners() for p in self.points))
-        return all_corners - self.sides() - self.points
+        corners = self._corners
+        if corners is None:
+            _, corners = self._borders()
+        return corners
 
-    def sides(self) -> Set["Point"]:
+    def sides(self) -> FrozenSet["Point"]:
         """Return a set of the sides of this Shape."""
-        all_sides = set.union(*(p.sides() for p in self.points))
-        return all_sides - self.points
+        sides = self._sides
+        if sides is None:
+            sides, _ = self._borders()
+        return sides
+
+    def _borders(self) -> Borders:
+        """Compute the sides and corners of this Shape together and store both."""
+        tile = self._tile()
+        if tile is not None:
+            sides, corners = _tile_borders(tile)
+        else:
+            sides, corners = _point_borders(self.points)
+        object.__setattr__(self, "_sides", sides)
+        object.__setattr__(self, "_corners", corners)
+        return sides, corners
+
+    def to_mask(self) -> ShapeMask:
+        """Return the ShapeMask representation of this Shape's points."""
+        return ShapeMask.from_points(self.points)
+
+    def _tile(self) -> Optional[ShapeMask]:
+        """Return this Shape's ShapeMask, or None if it is too large for a tile."""
+        tile = self._mask
+        if tile is None:
+            try:
+                tile = self.to_mask()
+            except ValueError:
+                tile = _NO_TILE
+            object.__setattr__(self, "_mask", tile)
+        return None if tile is _NO_TILE else tile
+
+    # pylint: disable=invalid-name
+    def is_within(
+        self, lower: Optional[int] = None, upper: Optional[int] = None
+    ) -> bool:
+        """
+        Return a boolean indicating whether all points lie within the bounds.
+
+        Examples
+        --------
+        >>> Shape.I2(Point(4, 4)).is_within(lower=4, upper=5)
+        True
+        >>> Shape.I2(Point(4, 4)).is_within(upper=4)
+        False
+        """
+        if lower is None and upper is None:
+            return True
+        low = lower if lower is not None else -float("inf")
+        high = upper if upper is not None else float("inf")
+        for x, y in self.points:
+            if not (low <= x <= high and low <= y <= high):
+                return False
+        return True
 
     def size(self) -> int:
         """Return the size of this shape (the number of points.)"""
@@ -63,15 +700,51 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
     # pylint: disable=invalid-name
     def reflect(self, x: Optional[int] = None, y: Optional[int] = None) -> "Shape":
         """Return a new shape by reflecting over x and/or y lines."""
-        origin = self.origin.reflect(x, y)
-        reflected = {point.reflect(x, y) for point in self.points}
-        return Shape(origin=origin, points=reflected)
+        return self._map(*_reflection(x, y))
 
     def rotate(self, around: Point, degrees: int) -> "Shape":
         """Return a new shape rotated by n degrees around a Point."""
-        origin = self.origin.rotate(around, degrees)
-        rotated = {point.rotate(around, degrees) for point in self.points}
-        return Shape(origin=origin, points=rotated)
+        return self._map(*_rotation(around, degrees))
+
+    def _map(self, matrix: Matrix, shift: Tuple[int, int]) -> "Shape":
+        """Return a new shape with its origin and points mapped the same way."""
+        (a, b), (c, d) = matrix
+        sx, sy = shift
+        x, y = self.origin
+        origin = point_from_tuple((a * x + b * y + sx, c * x + d * y + sy))
+        tile = self._tile()
+        points, tile = _transform(
+            self.points, _NO_TILE if tile is None else tile, matrix, shift
+        )
+        shape = Shape(origin=origin, points=points)
+        object.__setattr__(shape, "_mask", tile)
+        return shape
+
+    def translate(self, dx: int, dy: int) -> "Shape":
+        """
+        Return a new shape moved dx and dy away from this one.
+
+        Examples
+        --------
+        >>> Shape.I2(Point(0, 0)).translate(3, -1) == Shape.I2(Point(3, -1))
+        True
+        """
+        origin = point_from_tuple((self.origin.x + dx, self.origin.y + dy))
+        points = frozenset(point_from_tuple((x + dx, y + dy)) for x, y in self.points)
+        shape = Shape(origin=origin, points=points)
+        tile = self._mask
+        if tile is not None:
+            if tile is not _NO_TILE:
+                tile = ShapeMask(tile.mask, tile.ox + dx, tile.oy + dy)
+            object.__setattr__(shape, "_mask", tile)
+        return shape
+
+    @classmethod
+    def _piece(cls, name: str, origin: Point) -> "Shape":
+        """Return the named piece, translated from (0, 0) to an origin."""
+        if origin == ORIGIN:
+            return PIECES[name]
+        return _placed_piece(name, origin)
 
     @classmethod
     def I1(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -80,7 +753,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
 
         [X]
         """
-        return Shape(origin=origin, points={origin})
+        return cls._piece("I1", origin)
 
     @classmethod
     def I2(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -89,8 +762,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
 
         [X][ ]
         """
-        points = {origin, Point(x=origin.x + 1, y=origin.y)}
-        return Shape(origin=origin, points=points)
+        return cls._piece("I2", origin)
 
     @classmethod
     def I3(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -99,12 +771,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
 
         [X][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("I3", origin)
 
     @classmethod
     def V3(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -114,12 +781,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         [ ]
         [X][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x, y=origin.y + 1),
-            Point(x=origin.x + 1, y=origin.y),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("V3", origin)
 
     @classmethod
     def I4(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -128,13 +790,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
 
         [X][ ][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y),
-            Point(x=origin.x + 3, y=origin.y),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("I4", origin)
 
     @classmethod
     def L4(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -144,13 +800,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         [ ]
         [X][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x, y=origin.y + 1),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("L4", origin)
 
     @classmethod
     def O4(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -160,13 +810,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         [ ][ ]
         [X][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x, y=origin.y + 1),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 1, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("O4", origin)
 
     @classmethod
     def T4(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -176,13 +820,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
            [ ]
         [ ][X][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x - 1, y=origin.y),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("T4", origin)
 
     @classmethod
     def Z4(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -192,13 +830,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
            [ ][ ]
         [X][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 1, y=origin.y + 1),
-            Point(x=origin.x + 2, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("Z4", origin)
 
     @classmethod
     def F(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -209,14 +841,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
            [X][ ]
         [ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 1, y=origin.y + 1),
-            Point(x=origin.x + 2, y=origin.y + 1),
-            Point(x=origin.x + 1, y=origin.y + 2),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("F", origin)
 
     @classmethod
     def I5(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -225,14 +850,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
 
         [X][ ][ ][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y),
-            Point(x=origin.x + 3, y=origin.y),
-            Point(x=origin.x + 4, y=origin.y),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("I5", origin)
 
     @classmethod
     def L5(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -242,14 +860,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         [ ]
         [X][ ][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x, y=origin.y + 1),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y),
-            Point(x=origin.x + 3, y=origin.y),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("L5", origin)
 
     @classmethod
     def N(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -259,14 +870,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
               [ ][ ]
         [X][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y + 1),
-            Point(x=origin.x + 3, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("N", origin)
 
     @classmethod
     def P(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -276,14 +880,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
            [ ][ ]
         [X][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 1, y=origin.y + 1),
-            Point(x=origin.x + 2, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("P", origin)
 
     @classmethod
     def U(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -293,14 +890,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         [ ]   [ ]
         [ ][X][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x - 1, y=origin.y),
-            Point(x=origin.x - 1, y=origin.y + 1),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 1, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("U", origin)
 
     @classmethod
     def V5(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -311,14 +901,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         [ ]
         [X][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x, y=origin.y + 1),
-            Point(x=origin.x, y=origin.y + 2),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("V5", origin)
 
     @classmethod
     def W(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -329,14 +912,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
            [X][ ]
         [ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x - 1, y=origin.y - 1),
-            Point(x=origin.x, y=origin.y - 1),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 1, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("W", origin)
 
     @classmethod
     def X(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -347,14 +923,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
         [ ][X][ ]
            [ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x - 1, y=origin.y),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x, y=origin.y - 1),
-            Point(x=origin.x, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("X", origin)
 
     @classmethod
     def Y(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -364,14 +933,7 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
            [ ]
         [ ][X][ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x - 1, y=origin.y),
-            Point(x=origin.x, y=origin.y + 1),
-            Point(x=origin.x + 1, y=origin.y),
-            Point(x=origin.x + 2, y=origin.y),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("Y", origin)
 
     @classmethod
     def Z5(cls, origin: Point) -> "Shape":  # pylint: disable=invalid-name
@@ -382,11 +944,56 @@ class Shape(NamedTuple):  # pylint: disable=too-many-public-methods
            [X]
         [ ][ ]
         """
-        points = {
-            origin,
-            Point(x=origin.x - 1, y=origin.y - 1),
-            Point(x=origin.x, y=origin.y - 1),
-            Point(x=origin.x, y=origin.y + 1),
-            Point(x=origin.x + 1, y=origin.y + 1),
-        }
-        return Shape(origin=origin, points=points)
+        return cls._piece("Z5", origin)
+
+
+@lru_cache(maxsize=4096)
+def _arrangements(
+    shape: Shape, lower: Optional[int], upper: Optional[int]
+) -> FrozenSet[Shape]:
+    """Return the arrangements of a shape within bounds; see Shape.arrangements."""
+    origin_x, origin_y = shape.origin
+    shift = _pack(shape.origin)
+    key = tuple(sorted(k - shift for k in map(_pack, shape.points)))
+    arrangements = set()
+    for arrangement, min_x, min_y, max_x, max_y in _arrangements_at_origin(key):
+        if lower is not None and min(min_x + origin_x, min_y + origin_y) < lower:
+            continue
+        if upper is not None and max(max_x + origin_x, max_y + origin_y) > upper:
+            continue
+        arrangements.add(arrangement.translate(origin_x, origin_y))
+    return frozenset(arrangements)
+
+
+# shapes are immutable, so a piece placed at the same origin again, as happens on
+# every move probe of a search, can share the instance built the first time
+@lru_cache(maxsize=4096)
+def _placed_piece(name: str, origin: Point) -> Shape:
+    """Return the named piece translated from (0, 0) to an origin."""
+    return PIECES[name].translate(origin.x, origin.y)
+
+
+# every piece placed with its origin at (0, 0), built once at import
+PIECES: Dict[str, Shape] = {
+    name: Shape(ORIGIN, frozenset(Point(dx, dy) for dx, dy in offsets))
+    for name, offsets in PIECE_OFFSETS.items()
+}
+
+# every rotation and reflection of each piece around (0, 0), built once at import;
+# a piece at another origin is one of these translated by that origin
+PIECE_ARRANGEMENTS: Dict[str, FrozenSet[Shape]] = {
+    name: piece.arrangements() for name, piece in PIECES.items()
+}
+
+
+def _warm_caches() -> None:
+    """Compute the sides and corners of every piece arrangement ahead of time."""
+    for arrangements in PIECE_ARRANGEMENTS.values():
+        for arrangement in arrangements:
+            arrangement.sides()
+
+
+# fill the caches at import; the orientations and border bits are shared by every
+# placement of a piece, while the decoded border Points are still built once for
+# each new origin, since they are keyed on the whole ShapeMask
+_warm_caches()
@@ -1,7 +1,7 @@
 """Test point.py"""
 import unittest
 
-from blokus.point import Point
+from blokus.point import Point, point_from_tuple
 
 
 class TestPoint(unittest.TestCase):
@@ -63,6 +63,13 @@ class TestPoint(unittest.TestCase):
         reflection = Point(4, 4)
         self.assertEqual(point.reflect(x=x_value, y=y_value), reflection)
 
+    def test_reflect_zero(self):
+        """Test reflecting a point over the x and y axes"""
+        point = Point(4, 4)
+        self.assertEqual(point.reflect(x=0), Point(-4, 4))
+        self.assertEqual(point.reflect(y=0), Point(4, -4))
+        self.assertEqual(point.reflect(x=0, y=0), Point(-4, -4))
+
     def test_rotate_identity(self):
         """Test rotating a point over itself"""
         point = Point(4, 4)
@@ -87,3 +94,10 @@ class TestPoint(unittest.TestCase):
         self.assertEqual(point.rotate(around=around, degrees=180), Point(6, 4))
         self.assertEqual(point.rotate(around=around, degrees=270), Point(4, 8))
         self.assertEqual(point.rotate(around=around, degrees=-90), Point(4, 8))
+
+    def test_point_from_tuple(self):
+        """Test building a point directly from a tuple of coordinates"""
+        point = point_from_tuple((3, -2))
+        self.assertIsInstance(point, Point)
+        self.assertEqual(point, Point(3, -2))
+        self.assertEqual((point.x, point.y), (3, -2))
@@ -1,8 +1,17 @@
 """Test shape.py"""
+import copy
+import pickle
 import unittest
 
 from blokus.point import Point
-from blokus.shape import Shape
+from blokus.shape import (
+    PIECE_ARRANGEMENTS,
+    PIECES,
+    Shape,
+    ShapeMask,
+    corners_mask,
+    sides_mask,
+)
 
 
 class TestShape(unittest.TestCase):
@@ -40,6 +49,41 @@ class TestShape(unittest.TestCase):
         self.assertEqual(shape.rotate(around, 90).origin, origin.rotate(around, 90))
         self.assertEqual(shape.rotate(around, 180).origin, origin.rotate(around, 180))
         self.assertEqual(shape.rotate(around, 270).origin, origin.rotate(around, 270))
+        with self.assertRaises(ValueError):
+            shape.rotate(around, 45)
+
+    def test_immutable(self):
+        """Test that a shape's fields cannot be reassigned"""
+        shape = Shape.I2(Point(4, 4))
+        with self.assertRaises(AttributeError):
+            shape.origin = Point(0, 0)
+
+    def test_equality(self):
+        """Test that shapes with the same origin and points are equal"""
+        first = Shape.V3(Point(4, 4))
+        second = Shape(Point(4, 4), {Point(4, 4), Point(4, 5), Point(5, 4)})
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, Shape(Point(4, 5), second.points))
+
+    def test_copy_and_pickle(self):
+        """Test that shapes survive copy, deepcopy and pickle"""
+        shape = Shape.W(Point(5, 5))
+        shape.sides()
+        for clone in (
+            copy.copy(shape),
+            copy.deepcopy(shape),
+            pickle.loads(pickle.dumps(shape)),
+        ):
+            self.assertEqual(clone, shape)
+            self.assertEqual(clone.sides(), shape.sides())
+            self.assertTrue(clone.can_connect(Shape.I1(Point(7, 7))))
+
+    def test_cached_sides_corners(self):
+        """Test that repeated calls return the same sides and corners"""
+        shape = Shape.W(Point(5, 5))
+        self.assertIs(shape.sides(), shape.sides())
+        self.assertIs(shape.corners(), shape.corners())
 
     def test_w_sides(self):
         """Test returning the sides of the W shape"""
@@ -89,6 +133,17 @@ class TestShape(unittest.TestCase):
         self.assertEqual(shape.points, points)
         self.assertEqual(shape.origin, Point(11, 5))
 
+    def test_transform_tile(self):
+        """Test that rotated and reflected shapes carry a matching tile"""
+        shape = Shape.F(Point(5, 5))
+        for other in (shape.rotate(Point(2, 3), 90), shape.reflect(x=1, y=2)):
+            self.assertEqual(other.to_mask().points(), other.points)
+            self.assertEqual(other.sides(), Shape(other.origin, other.points).sides())
+        large = Shape(origin=Point(0, 0), points={Point(x, 0) for x in range(10)})
+        rotated = large.rotate(Point(0, 0), 90)
+        self.assertEqual(rotated.points, {Point(0, -x) for x in range(10)})
+        self.assertEqual(len(rotated.corners()), 4)
+
     def test_complex_shape_corners(self):
         """Test identifying the corners of a complex shape"""
         #    [X]   [X]
@@ -119,14 +174,172 @@ class TestShape(unittest.TestCase):
         shape = Shape(origin=origin, points=points)
         self.assertEqual(shape.corners(), corners)
 
+    def test_far_apart_points(self):
+        """Test the sides and corners of a shape with points far apart"""
+        shape = Shape(origin=Point(0, 0), points={Point(0, 0), Point(20000, 20000)})
+        self.assertEqual(len(shape.sides()), 8)
+        self.assertEqual(len(shape.corners()), 8)
+        self.assertIn(Point(19999, 20001), shape.corners())
+        self.assertTrue(shape.can_connect(Shape.I1(Point(1, 1))))
+
+    def test_translate(self):
+        """Test moving a shape by an offset"""
+        shape = Shape.W(Point(5, 5)).translate(2, -3)
+        points = {Point(7, 2), Point(6, 1), Point(7, 1), Point(8, 2), Point(8, 3)}
+        self.assertEqual(shape.points, points)
+        self.assertEqual(shape.origin, Point(7, 2))
+
     def test_can_connect_true(self):
         """Test two shapes that are allowed to connect"""
         first = Shape.V3(Point(5, 5))
         second = Shape.V3(Point(4, 4)).rotate(Point(4, 4), degrees=180)
         self.assertTrue(first.can_connect(second))
 
+    def test_can_connect_translated(self):
+        """Test connecting shapes that were moved after building their masks"""
+        first = Shape.L4(Point(0, 0)).rotate(Point(0, 0), degrees=90)
+        second = Shape.I2(Point(0, 0))
+        self.assertFalse(first.can_connect(second))
+        self.assertTrue(first.can_connect(second.translate(2, 1)))
+        self.assertFalse(first.can_connect(second.translate(1, 1)))
+        self.assertFalse(first.can_connect(second.translate(1, 0)))
+        self.assertFalse(first.can_connect(second.translate(8, 1)))
+
+    def test_can_connect_large_shape(self):
+        """Test connecting a shape too large for a tile to a piece"""
+        points = {Point(x, 0) for x in range(10)}
+        first = Shape(origin=Point(0, 0), points=points)
+        self.assertTrue(first.can_connect(Shape.I1(Point(10, 1))))
+        self.assertTrue(Shape.I1(Point(10, 1)).can_connect(first))
+        self.assertFalse(first.can_connect(Shape.I1(Point(10, 0))))
+        self.assertFalse(Shape.I1(Point(10, 0)).can_connect(first))
+
     def test_can_connect_false(self):
         """Test two shapes that are not allowed to connect"""
         first = Shape.V3(Point(5, 5))
         second = Shape.V3(Point(5, 4)).rotate(Point(5, 4), degrees=180)
         self.assertFalse(first.can_connect(second))
+
+
+class TestArrangements(unittest.TestCase):
+    """Test the Blokus pieces and the arrangements of shapes"""
+
+    def test_pieces_shared(self):
+        """Test that a piece placed at the same origin twice is the same shape"""
+        self.assertIs(Shape.W(Point(5, 5)), Shape.W(Point(5, 5)))
+        self.assertEqual(Shape.W(Point(5, 5)), Shape.W(Point(0, 0)).translate(5, 5))
+
+    def test_piece_arrangements(self):
+        """Test the arrangements of every piece built at import"""
+        self.assertEqual(PIECE_ARRANGEMENTS.keys(), PIECES.keys())
+        self.assertEqual(PIECE_ARRANGEMENTS["F"], Shape.F(Point(0, 0)).arrangements())
+        self.assertEqual(sum(map(len, PIECE_ARRANGEMENTS.values())), 102)
+
+    def test_arrangements(self):
+        """Test the number of distinct arrangements of some shapes"""
+        origin = Point(5, 5)
+        self.assertEqual(len(Shape.I1(origin).arrangements()), 1)
+        self.assertEqual(len(Shape.X(origin).arrangements()), 1)
+        self.assertEqual(len(Shape.I2(origin).arrangements()), 4)
+        self.assertEqual(len(Shape.O4(origin).arrangements()), 4)
+        self.assertEqual(len(Shape.W(origin).arrangements()), 4)
+        self.assertEqual(len(Shape.F(origin).arrangements()), 8)
+
+    def test_arrangements_empty(self):
+        """Test that a shape without points has no arrangements"""
+        self.assertEqual(Shape(Point(0, 0), set()).arrangements(), frozenset())
+
+    def test_arrangements_bounds(self):
+        """Test restricting arrangements to those within bounds"""
+        shape = Shape.V3(Point(0, 0))
+        arrangements = shape.arrangements(lower=0, upper=19)
+        points = {Point(0, 0), Point(1, 0), Point(0, 1)}
+        self.assertEqual(arrangements, {Shape(Point(0, 0), frozenset(points))})
+
+    def test_arrangements_cached(self):
+        """Test that equal shapes share cached arrangements, sides and corners"""
+        first = Shape.P(Point(6, 2))
+        second = Shape(Point(6, 2), set(first.points))
+        self.assertIs(first.arrangements(0, 19), second.arrangements(0, 19))
+        self.assertIs(first.sides(), second.sides())
+        self.assertIs(first.corners(), second.corners())
+
+    def test_arrangements_origin(self):
+        """Test that every arrangement keeps the shape's origin"""
+        shape = Shape.W(Point(3, 7))
+        for arrangement in shape.arrangements():
+            self.assertEqual(arrangement.origin, shape.origin)
+            self.assertIn(shape.origin, arrangement.points)
+
+
+class TestShapeMask(unittest.TestCase):
+    """Test ShapeMask class"""
+
+    def test_points(self):
+        """Test round-tripping a shape's points through a mask"""
+        shape = Shape.W(Point(5, 5))
+        self.assertEqual(shape.to_mask().points(), shape.points)
+
+    def test_w_sides(self):
+        """Test the sides of the W shape mask match the W shape"""
+        shape = Shape.W(Point(5, 5))
+        self.assertEqual(shape.to_mask().sides().points(), shape.sides())
+
+    def test_w_corners(self):
+        """Test the corners of the W shape mask match the W shape"""
+        shape = Shape.W(Point(5, 5))
+        self.assertEqual(shape.to_mask().corners().points(), shape.corners())
+
+    def test_rotation(self):
+        """Test rotating a mask matches rotating the shape"""
+        shape = Shape.F(Point(5, 5))
+        around = Point(2, 3)
+        for degrees in (0, 90, 180, 270, -90):
+            rotated = shape.to_mask().rotate(around, degrees)
+            self.assertEqual(rotated.points(), shape.rotate(around, degrees).points)
+
+    def test_reflection(self):
+        """Test reflecting a mask matches reflecting the shape"""
+        shape = Shape.N(Point(5, 5))
+        mask = shape.to_mask()
+        self.assertEqual(mask.reflect(x=8).points(), shape.reflect(x=8).points)
+        self.assertEqual(mask.reflect(y=2).points(), shape.reflect(y=2).points)
+        self.assertEqual(
+            mask.reflect(x=8, y=2).points(), shape.reflect(x=8, y=2).points
+        )
+
+    def test_orientations(self):
+        """Test the number of distinct orientations of some shape masks"""
+        origin = Point(5, 5)
+        self.assertEqual(len(Shape.X(origin).to_mask().orientations()), 1)
+        self.assertEqual(len(Shape.I2(origin).to_mask().orientations()), 2)
+        self.assertEqual(len(Shape.W(origin).to_mask().orientations()), 4)
+        self.assertEqual(len(Shape.F(origin).to_mask().orientations()), 8)
+
+    def test_orientations_match(self):
+        """Test that rotated and reflected shapes share the same orientations"""
+        mask = Shape.N(Point(5, 5)).to_mask()
+        moved = mask.rotate(Point(1, 2), 270).reflect(x=4)
+        self.assertEqual(mask.orientations(), moved.orientations())
+
+    def test_orientations_tile_edges(self):
+        """Test the orientations of masks that touch the edges of a tile"""
+        self.assertEqual(ShapeMask(1, 0, 0).orientations(), {1 << 9})
+        mask = Shape.W(Point(5, 5)).to_mask()
+        self.assertEqual(len(mask.corners().orientations()), 4)
+        self.assertEqual(len(mask.sides().orientations()), 4)
+
+    def test_tile_edges(self):
+        """Test that sides and corners do not wrap around the edges of a tile"""
+        right_edge = 1 << 15  # column 7, row 1
+        self.assertEqual(sides_mask(right_edge), 1 << 7 | 1 << 14 | 1 << 23)
+        self.assertEqual(corners_mask(right_edge), 1 << 6 | 1 << 22)
+        left_edge = 1 << 8  # column 0, row 1
+        self.assertEqual(sides_mask(left_edge), 1 << 0 | 1 << 9 | 1 << 16)
+        self.assertEqual(corners_mask(left_edge), 1 << 1 | 1 << 17)
+
+    def test_from_points_raises(self):
+        """Test raising an error for points that do not fit in a tile"""
+        points = {Point(0, 0), Point(6, 0)}
+        self.assertRaises(ValueError, ShapeMask.from_points, points)
+        self.assertRaises(ValueError, ShapeMask.from_points, set())